@@ -8,15 +8,35 @@ import serial
 import time
 import mido
 import argparse
+import heapq
+import itertools
+import operator
 import sys
 import os
 from pathlib import Path
 import random
 
+# Binary command frames understood by synth/synth.ino: [cmd, args...]
+# Durations are sent in 10ms units so they fit in a single byte (max 2550ms)
+CMD_NOTE_L = 0x10  # [CMD_NOTE_L + channel, note, duration]
+CMD_NOTE_R = 0x11
+CMD_CHORD = 0x20   # [CMD_CHORD, note1, note2, duration]
+CMD_MONO = 0x30    # [CMD_MONO, note, duration]
+CMD_STOP = 0xFF    # [CMD_STOP] - stop both channels
+
+def _precise_sleep(delay):
+    """Sleep for delay seconds, busy-waiting the last millisecond to avoid wakeup jitter"""
+    deadline = time.perf_counter() + delay
+    if delay > 0.002:
+        time.sleep(delay - 0.001)
+    while time.perf_counter() < deadline:
+        pass
+
 class ArduinoStereoPlayer:
-    def __init__(self, port='/dev/cu.usbmodem1101', baud_rate=9600):
+    def __init__(self, port='/dev/cu.usbmodem1101', baud_rate=9600, low_latency=False):
         self.port = port
         self.baud_rate = baud_rate
+        self.low_latency = low_latency
         self.arduino = None
         self.connected = False
         self.playing = False
@@ -25,6 +45,8 @@ class ArduinoStereoPlayer:
         """Connect to Arduino"""
         try:
             self.arduino = serial.Serial(self.port, self.baud_rate, timeout=1)
+            if self.low_latency:
+                self._reduce_usb_latency()
             time.sleep(2)  # Wait for Arduino to initialize
             self.connected = True
             print(f"Connected to Arduino Stereo Synth on {self.port}")
@@ -33,10 +55,39 @@ class ArduinoStereoPlayer:
             print(f"Failed to connect to Arduino: {e}")
             return False
     
+    def _reduce_usb_latency(self):
+        """Lower the USB-serial latency timer to 1ms (best effort, Linux only)"""
+        if not sys.platform.startswith('linux'):
+            return False
+        
+        tuned = False
+        try:
+            # Sets ASYNC_LOW_LATENCY on the tty (ftdi_sio maps it to a 1ms timer)
+            self.arduino.set_low_latency_mode(True)
+            tuned = True
+        except (AttributeError, NotImplementedError, ValueError):
+            pass
+        
+        devname = os.path.basename(os.path.realpath(self.port))
+        sysfs = f"/sys/bus/usb-serial/devices/{devname}/latency_timer"
+        if os.access(sysfs, os.W_OK):
+            try:
+                with open(sysfs, 'w') as f:
+                    f.write('1')
+                tuned = True
+            except OSError:
+                pass
+        
+        if tuned:
+            print(f"Low-latency mode enabled on {devname}")
+        else:
+            print(f"Could not enable low-latency mode on {devname} (needs root or udev rule)")
+        return tuned
+    
     def disconnect(self):
         """Disconnect from Arduino"""
         if self.arduino and self.connected:
-            self.send_command("STOP")
+            self.stop_channel()
             self.arduino.close()
             self.connected = False
             print("Disconnected from Arduino")
@@ -52,47 +103,54 @@ class ArduinoStereoPlayer:
             print(f"Error sending command: {e}")
             return False
     
+    def send_frame(self, frame):
+        """Send a binary command frame to Arduino"""
+        if not self.connected:
+            return False
+        try:
+            self.arduino.write(frame)
+            return True
+        except serial.SerialException as e:
+            print(f"Error sending command: {e}")
+            return False
+    
     def midi_to_frequency(self, midi_note):
         """Convert MIDI note number to frequency in Hz"""
         return 440.0 * (2.0 ** ((midi_note - 69) / 12.0))
     
     def play_note_on_channel(self, midi_note, duration_ms, channel):
         """Play a MIDI note on specific channel (0=left, 1=right)"""
-        frequency = self.midi_to_frequency(midi_note)
-        command = f"NOTE,{midi_note},{duration_ms},{channel}"
-        return self.send_command(command)
+        frame = bytes((CMD_NOTE_L + channel, midi_note, min(255, duration_ms // 10)))
+        return self.send_frame(frame)
     
     def play_chord(self, note1, note2, duration_ms):
         """Play two notes simultaneously as a chord"""
-        command = f"CHORD,{note1},{note2},{duration_ms}"
-        return self.send_command(command)
+        frame = bytes((CMD_CHORD, note1, note2, min(255, duration_ms // 10)))
+        return self.send_frame(frame)
     
     def play_mono_note(self, midi_note, duration_ms):
         """Play the same note on both channels simultaneously (true mono)"""
-        command = f"MONO,{midi_note},{duration_ms}"
-        return self.send_command(command)
+        frame = bytes((CMD_MONO, midi_note, min(255, duration_ms // 10)))
+        return self.send_frame(frame)
     
     def stop_channel(self, channel=None):
         """Stop specific channel or both"""
         if channel is None:
-            command = "STOP"
-        else:
-            command = f"STOP,{channel}"
-        return self.send_command(command)
+            return self.send_frame(bytes((CMD_STOP,)))
+        return self.send_command(f"STOP,{channel}")
     
     def get_status(self):
         """Get synth status"""
         return self.send_command("STATUS")
     
     def play_stereo_midi_file(self, midi_file_path, tempo_multiplier=1.0, loop=False, 
-                             stereo_mode="auto", bass_threshold=60):
+                             stereo_mode="auto", bass_threshold=60, realtime=False):
         """Play MIDI file with stereo separation"""
-        if not os.path.exists(midi_file_path):
-            print(f"MIDI file not found: {midi_file_path}")
-            return False
-        
         try:
             midi_file = mido.MidiFile(midi_file_path)
+        except FileNotFoundError:
+            print(f"MIDI file not found: {midi_file_path}")
+            return False
         except Exception as e:
             print(f"Error loading MIDI file: {e}")
             return False
@@ -102,6 +160,9 @@ class ArduinoStereoPlayer:
         print(f"Stereo mode: {stereo_mode}")
         print(f"Bass threshold: {bass_threshold} (notes below go to left)")
         
+        if realtime:
+            self._enable_realtime_priority()
+        
         self.playing = True
         
         try:
@@ -116,26 +177,47 @@ class ArduinoStereoPlayer:
             print("\nPlayback stopped by user")
         finally:
             self.playing = False
-            self.send_command("STOP")
+            self.stop_channel()
+    
+    def _enable_realtime_priority(self):
+        """Raise scheduling priority of the playback thread to reduce timing wobble"""
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(10))
+            print("Realtime priority: SCHED_FIFO")
+            return True
+        except (AttributeError, PermissionError, OSError):
+            pass  # Not Linux, or missing CAP_SYS_NICE
+        
+        try:
+            os.nice(-10)
+            print("Realtime priority: nice -10")
+            return True
+        except (AttributeError, PermissionError, OSError):
+            print("Could not raise playback priority (needs root or CAP_SYS_NICE)")
+            return False
     
     def _play_stereo_once(self, midi_file, tempo_multiplier, stereo_mode, bass_threshold):
         """Play MIDI file once with stereo processing"""
-        # Extract and process notes
-        notes = self._extract_notes(midi_file)
-        stereo_notes = self._assign_stereo_channels(notes, stereo_mode, bass_threshold)
+        stereo_notes = self._build_stereo_events(midi_file, stereo_mode, bass_threshold)
+        
+        # The first group runs mido.merge_tracks over the whole file, so pull
+        # it before starting the clock or the early notes all fire at once
+        first = next(stereo_notes, None)
+        if first is None:
+            return
         
-        print(f"\nPlaying {len(stereo_notes)} stereo events...")
+        print("\nPlaying stereo events...")
         
         # Play the stereo notes
-        start_time = time.time()
+        start_time = time.perf_counter()
         
-        for i, (note_time, events) in enumerate(stereo_notes):
+        for i, (note_time, events) in enumerate(itertools.chain((first,), stereo_notes)):
             # Wait until it's time for this event
             target_time = note_time / tempo_multiplier
-            current_time = time.time() - start_time
+            current_time = time.perf_counter() - start_time
             
             if target_time > current_time:
-                time.sleep(target_time - current_time)
+                _precise_sleep(target_time - current_time)
             
             # Process all events at this time point
             for event in events:
@@ -162,137 +244,126 @@ class ArduinoStereoPlayer:
                     self.play_mono_note(note, duration)
                     print(f"♪♪ MONO: {self._note_name(note)} on BOTH channels for {duration}ms")
     
-    def _extract_notes(self, midi_file):
-        """Extract notes from MIDI file"""
-        notes = []
+    def _build_stereo_events(self, midi_file, stereo_mode, bass_threshold):
+        """Stream (time, events) groups from the MIDI file in a single pass"""
+        time_tolerance = 0.05  # 50ms tolerance for "simultaneous" notes
+        channels = self._channel_table(stereo_mode, bass_threshold)
+        ticks_per_beat = midi_file.ticks_per_beat
         current_tempo = 500000  # Default MIDI tempo
+        current_tick = 0
+        tempo_tick = 0  # Tick and time of the last tempo change
+        tempo_time = 0.0
         
-        for track in midi_file.tracks:
-            current_time = 0
-            
-            for msg in track:
-                current_time += msg.time
-                
-                if msg.type == 'set_tempo':
-                    current_tempo = msg.tempo
-                
-                if msg.type == 'note_on' and msg.velocity > 0:
-                    # Skip drum channel
-                    if hasattr(msg, 'channel') and msg.channel == 9:
-                        continue
-                    
-                    time_seconds = mido.tick2second(current_time, midi_file.ticks_per_beat, current_tempo)
-                    notes.append((time_seconds, msg.note, msg.velocity))
-        
-        return sorted(notes, key=lambda x: x[0])
-    
-    def _assign_stereo_channels(self, notes, stereo_mode, bass_threshold):
-        """Assign notes to left/right channels and group simultaneous events"""
-        stereo_events = []
-        
-        # Group notes by time (with small tolerance for "simultaneous" notes)
-        time_groups = []
+        # A closed group is held back until the next one closes, since its
+        # duration depends on when the following group starts
+        pending = None
         current_group = []
         last_time = -1
-        time_tolerance = 0.05  # 50ms tolerance
         
-        for note_time, note, velocity in notes:
-            if current_group and abs(note_time - last_time) > time_tolerance:
-                time_groups.append((last_time, current_group))
-                current_group = []
+        for msg in mido.merge_tracks(midi_file.tracks):
+            current_tick += msg.time
+            
+            if msg.type == 'set_tempo':
+                tempo_time += mido.tick2second(current_tick - tempo_tick, ticks_per_beat, current_tempo)
+                tempo_tick = current_tick
+                current_tempo = msg.tempo
             
-            current_group.append((note, velocity))
-            last_time = note_time
+            # Skip drum channel
+            elif msg.type == 'note_on' and msg.velocity > 0 and msg.channel != 9:
+                current_time = tempo_time + mido.tick2second(current_tick - tempo_tick, ticks_per_beat, current_tempo)
+                if current_group and current_time - last_time > time_tolerance:
+                    if pending:
+                        base_duration = max(100, min(1000, int((last_time - pending[0]) * 1000 * 0.9)))
+                        yield pending[0], self._group_events(pending[1], base_duration, stereo_mode, channels)
+                    pending = (last_time, current_group)
+                    current_group = []
+                
+                current_group.append((msg.note, msg.velocity))
+                last_time = current_time
         
         if current_group:
-            time_groups.append((last_time, current_group))
+            if pending:
+                base_duration = max(100, min(1000, int((last_time - pending[0]) * 1000 * 0.9)))
+                yield pending[0], self._group_events(pending[1], base_duration, stereo_mode, channels)
+            pending = (last_time, current_group)
         
-        # Process each time group
-        for i, (group_time, group_notes) in enumerate(time_groups):
-            events = []
-            
-            # Calculate duration to next group
-            if i < len(time_groups) - 1:
-                next_time = time_groups[i + 1][0]
-                base_duration = max(100, min(1000, int((next_time - group_time) * 1000 * 0.9)))
-            else:
-                base_duration = 500
-            
-            if len(group_notes) == 1:
-                # Single note - assign channel based on mode
-                note, velocity = group_notes[0]
-                
-                if stereo_mode in ['mono', 'sync']:
-                    # Play same note on both channels for fuller sound using MONO command
-                    events.append({
-                        'type': 'mono',
-                        'note': note,
-                        'duration': base_duration
-                    })
-                else:
-                    channel = self._assign_channel(note, stereo_mode, bass_threshold)
-                    events.append({
-                        'type': 'note',
-                        'note': note,
-                        'duration': base_duration,
-                        'channel': channel
-                    })
-            
-            elif len(group_notes) == 2:
-                # Two notes - play as chord or separate channels
-                note1, vel1 = group_notes[0]
-                note2, vel2 = group_notes[1]
-                
-                if stereo_mode == "chord":
-                    events.append({
-                        'type': 'chord',
-                        'note1': note1,
-                        'note2': note2,
-                        'duration': base_duration
-                    })
-                else:
-                    # Assign to different channels
-                    events.append({
-                        'type': 'note',
-                        'note': note1,
-                        'duration': base_duration,
-                        'channel': 0  # Left
-                    })
-                    events.append({
-                        'type': 'note',
-                        'note': note2,
-                        'duration': base_duration,
-                        'channel': 1  # Right
-                    })
-            
+        if pending:
+            yield pending[0], self._group_events(pending[1], 500, stereo_mode, channels)
+    
+    def _group_events(self, group_notes, base_duration, stereo_mode, channels):
+        """Turn a group of simultaneous notes into note/chord/mono events"""
+        events = []
+        
+        if len(group_notes) == 1:
+            # Single note - assign channel based on mode
+            note, velocity = group_notes[0]
+        
+            if stereo_mode in ['mono', 'sync']:
+                # Play same note on both channels for fuller sound using MONO command
+                events.append({
+                    'type': 'mono',
+                    'note': note,
+                    'duration': base_duration
+                })
             else:
-                # Multiple notes - select best two
-                group_notes.sort(key=lambda x: x[1], reverse=True)  # Sort by velocity
-                note1, vel1 = group_notes[0]  # Loudest
-                note2, vel2 = group_notes[1]  # Second loudest
-                
+                channel = channels[note] if channels else random.randint(0, 1)
+                events.append({
+                    'type': 'note',
+                    'note': note,
+                    'duration': base_duration,
+                    'channel': channel
+                })
+        
+        elif len(group_notes) == 2:
+            # Two notes - play as chord or separate channels
+            note1, vel1 = group_notes[0]
+            note2, vel2 = group_notes[1]
+        
+            if stereo_mode == "chord":
                 events.append({
                     'type': 'chord',
                     'note1': note1,
                     'note2': note2,
                     'duration': base_duration
                 })
-            
-            if events:
-                stereo_events.append((group_time, events))
+            else:
+                # Assign to different channels
+                events.append({
+                    'type': 'note',
+                    'note': note1,
+                    'duration': base_duration,
+                    'channel': 0  # Left
+                })
+                events.append({
+                    'type': 'note',
+                    'note': note2,
+                    'duration': base_duration,
+                    'channel': 1  # Right
+                })
+        
+        else:
+            # Multiple notes - select best two by velocity
+            loudest = heapq.nlargest(2, group_notes, key=operator.itemgetter(1))
+            note1, vel1 = loudest[0]  # Loudest
+            note2, vel2 = loudest[1]  # Second loudest
+        
+            events.append({
+                'type': 'chord',
+                'note1': note1,
+                'note2': note2,
+                'duration': base_duration
+            })
         
-        return stereo_events
+        return events
     
-    def _assign_channel(self, note, stereo_mode, bass_threshold):
-        """Assign a note to left (0) or right (1) channel"""
-        if stereo_mode == "bass_split":
-            return 0 if note < bass_threshold else 1
-        elif stereo_mode == "random":
-            return random.randint(0, 1)
+    def _channel_table(self, stereo_mode, bass_threshold):
+        """Precompute the channel (0=left, 1=right) for every MIDI note, None in random mode"""
+        if stereo_mode == "random":
+            return None
         elif stereo_mode == "alternate":
-            return note % 2
-        else:  # "auto"
-            return 0 if note < bass_threshold else 1
+            return tuple(note % 2 for note in range(128))
+        else:  # "auto" / "bass_split"
+            return tuple(0 if note < bass_threshold else 1 for note in range(128))
     
     def _note_name(self, midi_note):
         """Convert MIDI note to name"""
@@ -338,11 +409,15 @@ def main():
                        help='MIDI note threshold for bass (notes below go left)')
     parser.add_argument('--demo', action='store_true',
                        help='Run stereo chord demo')
+    parser.add_argument('--realtime', action='store_true',
+                       help='Run playback with realtime (SCHED_FIFO) priority, falling back to nice -10')
+    parser.add_argument('--low-latency', action='store_true',
+                       help='Set the USB-serial latency timer to 1ms (Linux, needs write access to sysfs)')
     
     args = parser.parse_args()
     
     # Create player instance
-    player = ArduinoStereoPlayer(args.port, args.baud)
+    player = ArduinoStereoPlayer(args.port, args.baud, args.low_latency)
     
     # Connect to Arduino
     if not player.connect():
@@ -353,7 +428,7 @@ def main():
             demo_stereo_chords(player)
         elif args.file:
             player.play_stereo_midi_file(args.file, args.tempo, args.loop, 
-                                       args.stereo_mode, args.bass_threshold)
+                                       args.stereo_mode, args.bass_threshold, args.realtime)
         else:
             print("No file specified. Use --file to specify a MIDI file or --demo for demo")
             
@@ -8,6 +8,17 @@
  * - MONO,MIDI_NUM,DURATION - Play same note on both channels (true mono)
  * - STOP[,CHANNEL] - Stop current tone on channel (no channel = stop both)
  * - STATUS - Get current status
+ *
+ * Binary frames (NOTE/CHORD/MONO/STOP are sent by stereo_midi_player.py):
+ * - 0x01 FREQ:       [0x01, FREQ float32, DURATION_MS uint16, CHANNEL, ATTACK_MS uint16]
+ *                    little-endian, 10 bytes; ATTACK is accepted but unused here
+ * Note frames below carry DURATION in 10ms units:
+ * - 0x10 NOTE LEFT:  [0x10, MIDI_NUM, DURATION]
+ * - 0x11 NOTE RIGHT: [0x11, MIDI_NUM, DURATION]
+ * - 0x20 CHORD:      [0x20, NOTE1, NOTE2, DURATION]
+ * - 0x30 MONO:       [0x30, MIDI_NUM, DURATION]
+ * - 0xFF STOP:       [0xFF] - stop both channels
+ * Any other leading byte is read as a newline-terminated text command.
  */
 
 #include <Arduino.h>
@@ -22,6 +33,18 @@ unsigned long noteStartTime[2] = {0, 0};
 unsigned long noteDuration[2] = {0, 0};
 float currentFreq[2] = {0, 0};
 
+// Binary command frames
+const byte CMD_FREQ = 0x01;
+const byte CMD_NOTE_L = 0x10;
+const byte CMD_NOTE_R = 0x11;
+const byte CMD_CHORD = 0x20;
+const byte CMD_MONO = 0x30;
+const byte CMD_STOP = 0xFF;
+
+byte frame[10];
+byte frameLength = 0;  // Bytes received for the current frame
+byte frameSize = 0;    // Expected frame size, 0 = waiting for a command byte
+
 void setup() {
   Serial.begin(9600);
   pinMode(LEFT_SPEAKER_PIN, OUTPUT);
@@ -63,11 +86,81 @@ void loop() {
     digitalWrite(LED_PIN, isPlaying[0] || isPlaying[1]);
     
     // Process serial commands
-    if (Serial.available() > 0) {
-      String input = Serial.readStringUntil('\n');
-      input.trim();
-      processCommand(input);
+    processSerial();
+  }
+}
+
+byte binaryFrameSize(byte command) {
+  switch (command) {
+    case CMD_NOTE_L:
+    case CMD_NOTE_R:
+    case CMD_MONO:
+      return 3;
+    case CMD_CHORD:
+      return 4;
+    case CMD_STOP:
+      return 1;
+    case CMD_FREQ:
+      return 10;
+    default:
+      return 0;
+  }
+}
+
+void processSerial() {
+  while (Serial.available() > 0) {
+    if (frameSize == 0) {
+      frameSize = binaryFrameSize(Serial.peek());
+      frameLength = 0;
+      
+      if (frameSize == 0) {
+        // Text command
+        String input = Serial.readStringUntil('\n');
+        input.trim();
+        processCommand(input);
+        return;
+      }
+    }
+    
+    frame[frameLength++] = Serial.read();
+    if (frameLength == frameSize) {
+      processFrame();
+      frameSize = 0;
+    }
+  }
+}
+
+void processFrame() {
+  switch (frame[0]) {
+    case CMD_FREQ: {
+      // AVR floats and ints are little-endian like the frame
+      float frequency;
+      uint16_t duration;
+      memcpy(&frequency, &frame[1], sizeof(frequency));
+      memcpy(&duration, &frame[5], sizeof(duration));
+      if (frame[7] <= 1) {
+        playToneOnChannel(frequency, duration, frame[7]);
+      }
+      break;
+    }
+    case CMD_NOTE_L:
+    case CMD_NOTE_R:
+      playToneOnChannel(midiToFrequency(frame[1]), frame[2] * 10, frame[0] - CMD_NOTE_L);
+      break;
+    case CMD_CHORD:
+      playToneOnChannel(midiToFrequency(frame[1]), frame[3] * 10, 0); // Left channel
+      playToneOnChannel(midiToFrequency(frame[2]), frame[3] * 10, 1); // Right channel
+      break;
+    case CMD_MONO: {
+      float frequency = midiToFrequency(frame[1]);
+      playToneOnChannel(frequency, frame[2] * 10, 0); // Left channel
+      playToneOnChannel(frequency, frame[2] * 10, 1); // Right channel
+      break;
     }
+    case CMD_STOP:
+      stopChannel(0);
+      stopChannel(1);
+      break;
   }
 }
 
@@ -233,7 +326,7 @@ void printStatus() {
   }
 }
 
-void playToneOnChannel(float frequency, int duration, int channel) {
+void playToneOnChannel(float frequency, unsigned long duration, int channel) {
   int pin = (channel == 0) ? LEFT_SPEAKER_PIN : RIGHT_SPEAKER_PIN;
   
 startPWM(pin, frequency);
@@ -7,13 +7,18 @@ A modern terminal interface with real-time visualization and MIDI playback
 import serial
 import time
 import threading
+import queue
+import heapq
+import operator
 import sys
 import os
 from pathlib import Path
 import random
+from collections import OrderedDict, deque
 from datetime import datetime
 import mido
-import select
+import numpy as np
+import selectors
 import termios
 import tty
 
@@ -26,17 +31,50 @@ from rich.live import Live
 from rich.align import Align
 from rich import box
 
+# Lookup tables indexed by MIDI note number
+_PITCH_CLASSES = ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')
+_NOTE_NAMES = tuple(f"{_PITCH_CLASSES[n % 12]}{(n // 12) - 1}" for n in range(128))
+_MIDI_FREQ = tuple(440.0 * (2.0 ** ((n - 69) / 12.0)) for n in range(128))
+
+def _absolute_ticks(track):
+    """Yield (absolute_tick, msg) for each message of a MIDI track"""
+    tick = 0
+    for msg in track:
+        tick += msg.time
+        yield tick, msg
+
 class ArduinoSynthTUI:
+    # Reverse of _NOTE_NAMES for parsing note names back to MIDI numbers
+    _NOTE_NUMBERS = {name: n for n, name in enumerate(_NOTE_NAMES)}
+    
+    # Panels showing animation, uptime or timestamps are rebuilt every frame
+    _LIVE_PANELS = ("visualizer", "file_info")
+    
+    # Redraw on state changes, but no faster than 20 fps and no slower than 4 fps
+    _MIN_FRAME_INTERVAL = 0.05
+    _MAX_FRAME_INTERVAL = 0.25
+    
+    # Number of parsed MIDI files kept in memory
+    _MIDI_CACHE_SIZE = 8
+    
+    # Visualizer bar strings indexed by bar height (0-8)
+    _BAR_LUT = tuple("█" * h + "░" * (8 - h) for h in range(9))
+    
     def __init__(self, port='/dev/cu.usbmodem1101', baud_rate=9600):
         self.console = Console()
         self.port = port
         self.baud_rate = baud_rate
         self.arduino = None
         self.connected = False
+        
+        # Serial output: commands are queued and written by a background thread
+        self._tx_queue = queue.SimpleQueue()
+        self._tx_thread = None
         self.playing = False
         self.running = False
         self.browsing_files = False
         self.selected_file_index = 0
+        self._browser_files = []  # File list snapshot taken when the browser opens
         
         # Status tracking
         self.current_file = None
@@ -44,13 +82,55 @@ class ArduinoSynthTUI:
         self.tempo_multiplier = 1.0
         self.notes_played = 0
         self.start_time = None
+        self._log = deque(maxlen=4)  # (timestamp, message), last 4 entries
+        self._clock_second = None  # Cached log timestamp, see _clock_string
+        self._clock_text = ""
         self.last_note = {"left": None, "right": None}
-        self.channel_activity = {"left": False, "right": False}
+        self.last_note_midi = {"left": None, "right": None}
+        self.channel_activity = {"left": False, "right": False}  # Refreshed every frame
+        self._activity_until = {"left": 0.0, "right": 0.0}  # Monotonic note-off deadlines
+        self._viz = deque([1] * 16, maxlen=16)  # Visualizer bar heights, scrolling left
+        
+        # Parsed MIDI files: (path, mtime) -> (times, notes, durations), LRU order
+        self._midi_cache = OrderedDict()
+        
+        # Key bindings
+        self._scale_keys = {'1': 60, '2': 62, '3': 64, '4': 65, '5': 67}  # C major scale notes
+        self._key_actions = {
+            'q': self.quit_app,
+            ' ': self.play_demo_note,
+            'c': self.play_chord,
+            'r': self.reset_stats,
+            'm': self.show_midi_browser,  # MIDI file browser
+            's': self.stop_playback,
+        }
         
         # TUI state
         self.layout = Layout()
         self.setup_layout()
         
+        # Static panels never change, so they are built once
+        self._header_panel = self.create_header()
+        self._controls_panel = self.create_controls_panel()
+        self._footer_panel = self.create_footer()
+        self.layout["header"].update(self._header_panel)
+        self.layout["controls"].update(self._controls_panel)
+        self.layout["footer"].update(self._footer_panel)
+        
+        # Panel rendering: only panels marked dirty (plus the time-driven
+        # ones) are rebuilt on each frame
+        self._panel_builders = {
+            "connection": self.create_connection_panel,
+            "channels": self.create_channels_panel,
+            "visualizer": self.create_visualizer_panel,
+            "file_info": self.create_file_info_panel,
+            "stats": self.create_stats_panel,
+            "log": self.create_log_panel,
+        }
+        self._panel_cache = {}
+        self._dirty = set(self._panel_builders)
+        self._needs_refresh = threading.Event()  # Wakes the refresh thread early
+        
     def setup_layout(self):
         """Setup the TUI layout"""
         self.layout.split_column(
@@ -83,13 +163,10 @@ class ArduinoSynthTUI:
     
     def create_header(self):
         """Create the header panel"""
-        title = Text("🎵 ARDUINO STEREO SYNTHESIZER 🎵", style="bold magenta")
-        subtitle = Text("Real-time MIDI Player with Beautiful Visualization", style="italic cyan")
-        
-        header_text = Text()
-        header_text.append(title)
-        header_text.append("\n")
-        header_text.append(subtitle)
+        header_text = Text.from_markup(
+            "[bold magenta]🎵 ARDUINO STEREO SYNTHESIZER 🎵[/]\n"
+            "[italic cyan]Real-time MIDI Player with Beautiful Visualization[/]"
+        )
         
         return Panel(
             Align.center(header_text),
@@ -178,22 +255,10 @@ class ArduinoSynthTUI:
                 vertical="middle"
             )
         else:
-            # Create a simple ASCII visualizer
-            bars = []
-            for i in range(16):
-                if self.channel_activity["left"] or self.channel_activity["right"]:
-                    height = random.randint(3, 8)
-                else:
-                    height = 1
-                bar = "█" * height + "░" * (8 - height)
-                bars.append(bar)
-            
-            viz_lines = []
-            for row in range(8):
-                line = ""
-                for bar in bars:
-                    line += bar[row] + " "
-                viz_lines.append(line)
+            # Create a simple ASCII visualizer, scrolling in one new bar per frame
+            self._viz.append(random.randint(3, 8))
+            bars = [self._BAR_LUT[height] for height in self._viz]
+            viz_lines = ["".join(bar[row] + " " for bar in bars) for row in range(8)]
             
             viz_text = Text("\n".join(viz_lines), style="bright_magenta")
             viz_content = Align.center(viz_text, vertical="middle")
@@ -223,7 +288,7 @@ class ArduinoSynthTUI:
             table.add_row("Status:", "🎵 Playing")
         
         if self.start_time:
-            elapsed = int(time.time() - self.start_time)
+            elapsed = int(time.monotonic() - self.start_time)
             table.add_row("Uptime:", f"{elapsed//60:02d}:{elapsed%60:02d}")
         
         return Panel(
@@ -242,8 +307,8 @@ class ArduinoSynthTUI:
         table.add_row("Status:", "🎵 Demo Mode" if self.connected else "❌ Offline")
         
         # Show frequency info if playing
-        if self.last_note["left"]:
-            freq = self.midi_to_frequency(self.note_name_to_midi(self.last_note["left"]))
+        if self.last_note_midi["left"] is not None:
+            freq = self.midi_to_frequency(self.last_note_midi["left"])
             table.add_row("Last Freq:", f"{freq:.1f} Hz")
         
         return Panel(
@@ -252,23 +317,22 @@ class ArduinoSynthTUI:
             border_style="green"
         )
     
+    def log(self, message):
+        """Add an entry to the activity log"""
+        self._log.append((self._clock_string(), message))
+        self.mark_dirty("log")
+    
+    def _clock_string(self):
+        """Wall-clock HH:MM:SS, formatted at most once per second"""
+        second = int(time.time())
+        if second != self._clock_second:
+            self._clock_second = second
+            self._clock_text = datetime.fromtimestamp(second).strftime('%H:%M:%S')
+        return self._clock_text
+    
     def create_log_panel(self):
         """Create log panel"""
-        current_time = datetime.now().strftime('%H:%M:%S')
-        
-        log_entries = [
-            f"{current_time} - System ready",
-        ]
-        
-        if self.connected:
-            log_entries.append(f"{current_time} - Arduino connected")
-        else:
-            log_entries.append(f"{current_time} - Waiting for Arduino")
-        
-        if self.notes_played > 0:
-            log_entries.append(f"{current_time} - {self.notes_played} notes played")
-        
-        log_text = "\n".join(log_entries[-4:])  # Show last 4 entries
+        log_text = "\n".join(f"{timestamp} - {message}" for timestamp, message in list(self._log))
         
         return Panel(
             Text(log_text, style="dim"),
@@ -278,14 +342,11 @@ class ArduinoSynthTUI:
     
     def create_footer(self):
         """Create footer with help text"""
-        help_text = Text()
-        help_text.append("Press ", style="dim")
-        help_text.append("[Q]", style="bold red")
-        help_text.append(" to quit, ", style="dim")
-        help_text.append("[Space]", style="bold cyan")
-        help_text.append(" for demo note, ", style="dim")
-        help_text.append("[1-5]", style="bold magenta")
-        help_text.append(" for scale notes", style="dim")
+        help_text = Text.from_markup(
+            "[dim]Press [/][bold red]\\[Q][/][dim] to quit, [/]"
+            "[bold cyan]\\[Space][/][dim] for demo note, [/]"
+            "[bold magenta]\\[1-5][/][dim] for scale notes[/]"
+        )
         
         return Panel(
             Align.center(help_text),
@@ -293,17 +354,35 @@ class ArduinoSynthTUI:
             box=box.SIMPLE
         )
     
+    def mark_dirty(self, *panels):
+        """Schedule panels to be rebuilt on the next frame"""
+        self._dirty.update(panels)
+        self._needs_refresh.set()
+    
     def update_display(self):
-        """Update all panels"""
-        self.layout["header"].update(self.create_header())
-        self.layout["connection"].update(self.create_connection_panel())
-        self.layout["channels"].update(self.create_channels_panel())
-        self.layout["controls"].update(self.create_controls_panel())
-        self.layout["visualizer"].update(self.create_visualizer_panel())
-        self.layout["file_info"].update(self.create_file_info_panel())
-        self.layout["stats"].update(self.create_stats_panel())
-        self.layout["log"].update(self.create_log_panel())
-        self.layout["footer"].update(self.create_footer())
+        """Rebuild panels whose state changed"""
+        # Notes end lazily: derive activity from the deadlines once per frame
+        now = time.monotonic()
+        for channel, until in self._activity_until.items():
+            active = now < until
+            if self.channel_activity[channel] != active:
+                self.channel_activity[channel] = active
+                self.mark_dirty("channels")
+        
+        self._dirty.update(self._LIVE_PANELS)
+        # pop() is atomic, so marks from the input and playback threads are never lost
+        while self._dirty:
+            name = self._dirty.pop()
+            panel = self._panel_builders[name]()
+            cached = self._panel_cache.get(name)
+            if cached is None:
+                self._panel_cache[name] = panel
+                self.layout[name].update(panel)
+            else:
+                # Keep the Panel already in the layout, only swap what changes
+                cached.renderable = panel.renderable
+                cached.title = panel.title
+                cached.border_style = panel.border_style
     
     def play_midi_file(self, midi_file_path):
         """Play a MIDI file using mido with better playback"""
@@ -312,51 +391,20 @@ class ArduinoSynthTUI:
             return
             
         try:
-            midi_file = mido.MidiFile(midi_file_path)
+            times, pitches, durations = self.load_midi_notes(midi_file_path)
             self.playing = True
-            
-            # Extract notes for better playback
-            notes = []
-            current_tempo = 500000  # Default MIDI tempo
-            
-            for track in midi_file.tracks:
-                current_time = 0
-                for msg in track:
-                    current_time += msg.time
-                    
-                    if msg.type == 'set_tempo':
-                        current_tempo = msg.tempo
-                    
-                    if msg.type == 'note_on' and msg.velocity > 0:
-                        # Skip drum channel
-                        if hasattr(msg, 'channel') and msg.channel == 9:
-                            continue
-                        
-                        time_seconds = mido.tick2second(current_time, midi_file.ticks_per_beat, current_tempo)
-                        notes.append((time_seconds, msg.note, msg.velocity))
-            
-            # Sort notes by time
-            notes.sort(key=lambda x: x[0])
+            self.log(f"Playing {Path(midi_file_path).name}")
             
             # Play the notes
-            start_time = time.time()
-            for i, (note_time, note, velocity) in enumerate(notes):
+            start_time = time.monotonic()
+            for note_time, note, note_duration in zip(times.tolist(), pitches.tolist(), durations.tolist()):
                 if not self.playing or not self.running:
                     break
                     
                 # Wait until it's time for this note
-                target_time = note_time
-                current_time = time.time() - start_time
-                
-                if target_time > current_time:
-                    time.sleep(target_time - current_time)
-                
-                # Calculate note duration
-                if i < len(notes) - 1:
-                    next_note_time = notes[i + 1][0]
-                    note_duration = max(100, min(1000, int((next_note_time - target_time) * 1000 * 0.9)))
-                else:
-                    note_duration = 500
+                delay = note_time - (time.monotonic() - start_time)
+                if delay > 0:
+                    time.sleep(delay)
                 
                 # Play the note
                 self.play_mono_note(note, note_duration)
@@ -366,69 +414,138 @@ class ArduinoSynthTUI:
         finally:
             self.playing = False
     
+    def load_midi_notes(self, midi_file_path):
+        """Return (times, notes, durations) arrays for a MIDI file, cached by path and mtime"""
+        key = (midi_file_path, os.path.getmtime(midi_file_path))
+        if key in self._midi_cache:
+            self._midi_cache.move_to_end(key)
+            return self._midi_cache[key]
+        
+        midi_file = mido.MidiFile(midi_file_path)
+        
+        # Extract notes for better playback. Each track is already in time
+        # order, so a heap merge yields the notes sorted without a full sort
+        times = []
+        pitches = []
+        sec_per_tick = 500000 / 1e6 / midi_file.ticks_per_beat  # Default MIDI tempo
+        current_time = 0.0
+        last_tick = 0
+        
+        tracks = (_absolute_ticks(track) for track in midi_file.tracks)
+        for tick, msg in heapq.merge(*tracks, key=operator.itemgetter(0)):
+            current_time += (tick - last_tick) * sec_per_tick
+            last_tick = tick
+            
+            if msg.type == 'set_tempo':
+                sec_per_tick = msg.tempo / 1e6 / midi_file.ticks_per_beat
+            
+            # Skip drum channel
+            elif msg.type == 'note_on' and msg.velocity > 0 and msg.channel != 9:
+                times.append(current_time)
+                pitches.append(msg.note)
+        
+        # Note durations: 90% of the gap to the next note, 500ms for the last
+        times = np.array(times)
+        durations = np.full(len(times), 500, dtype=np.int32)
+        if len(times) > 1:
+            durations[:-1] = np.clip((np.diff(times) * 900).astype(np.int32), 100, 1000)
+        
+        parsed = (times, np.array(pitches, dtype=np.uint8), durations)
+        self._midi_cache[key] = parsed
+        if len(self._midi_cache) > self._MIDI_CACHE_SIZE:
+            self._midi_cache.popitem(last=False)  # Drop least recently played
+        return parsed
+    
     def connect(self):
         """Connect to Arduino"""
         try:
             self.arduino = serial.Serial(self.port, self.baud_rate, timeout=1)
             time.sleep(2)
             self.connected = True
+            self._tx_thread = threading.Thread(target=self._tx_loop, daemon=True)
+            self._tx_thread.start()
+            self.log("Arduino connected")
             return True
         except serial.SerialException:
             self.connected = False
+            self.log("Waiting for Arduino")
             return False
+        finally:
+            self.mark_dirty("connection", "stats")
     
     def disconnect(self):
         """Disconnect from Arduino"""
         if self.arduino and self.connected:
-            self.arduino.close()
             self.connected = False
+            self._tx_queue.put(None)  # Let the writer flush what is queued and exit
+            self._tx_thread.join(timeout=1)
+            self.arduino.close()
+            self.mark_dirty("connection", "stats")
+            self.log("Arduino disconnected")
     
     def send_command(self, command):
-        """Send command to Arduino"""
+        """Queue command for the serial writer thread"""
         if not self.connected:
             return False
-        try:
-            self.arduino.write(f"{command}\n".encode())
-            return True
-        except serial.SerialException:
-            return False
+        self._tx_queue.put(f"{command}\n".encode())
+        return True
+    
+    def _tx_loop(self):
+        """Write queued commands to Arduino, coalescing bursts into a single write"""
+        running = True
+        while running:
+            command = self._tx_queue.get()
+            if command is None:
+                break
+            
+            buffer = bytearray(command)
+            while len(buffer) < 4096:
+                try:
+                    command = self._tx_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if command is None:
+                    running = False
+                    break
+                buffer += command
+            
+            try:
+                self.arduino.write(buffer)
+            except serial.SerialException:
+                pass
     
     def play_mono_note(self, midi_note, duration_ms):
         """Play mono note and update UI"""
         self.send_command(f"MONO,{midi_note},{duration_ms}")
-        self.channel_activity["left"] = True
-        self.channel_activity["right"] = True
-        self.last_note["left"] = self._note_name(midi_note)
-        self.last_note["right"] = self._note_name(midi_note)
+        self._set_activity(duration_ms)
+        self.last_note["left"] = self.last_note["right"] = _NOTE_NAMES[midi_note]
+        self.last_note_midi["left"] = self.last_note_midi["right"] = midi_note
         self.notes_played += 1
-        
-        # Reset activity after duration
-        threading.Timer(duration_ms / 1000, self._reset_activity).start()
+        self.mark_dirty("channels", "stats")
+    
+    def _set_activity(self, duration_ms):
+        """Mark both channels active until the note ends"""
+        until = time.monotonic() + duration_ms / 1000
+        self._activity_until["left"] = until
+        self._activity_until["right"] = until
     
     def _reset_activity(self):
         """Reset channel activity"""
-        self.channel_activity["left"] = False
-        self.channel_activity["right"] = False
+        self._activity_until["left"] = 0.0
+        self._activity_until["right"] = 0.0
+        self.mark_dirty("channels")
     
     def _note_name(self, midi_note):
         """Convert MIDI note to name"""
-        notes = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-        octave = (midi_note // 12) - 1
-        note = notes[midi_note % 12]
-        return f"{note}{octave}"
+        return _NOTE_NAMES[midi_note]
     
     def note_name_to_midi(self, note_name):
         """Convert note name back to MIDI number"""
-        notes = {'C': 0, 'C#': 1, 'D': 2, 'D#': 3, 'E': 4, 'F': 5, 'F#': 6, 'G': 7, 'G#': 8, 'A': 9, 'A#': 10, 'B': 11}
-        if len(note_name) < 2:
-            return 60  # Default to C4
-        note = note_name[:-1]
-        octave = int(note_name[-1])
-        return (octave + 1) * 12 + notes.get(note, 0)
+        return self._NOTE_NUMBERS.get(note_name, 60)  # Default to C4
     
     def midi_to_frequency(self, midi_note):
         """Convert MIDI note to frequency"""
-        return 440.0 * (2.0 ** ((midi_note - 69) / 12.0))
+        return _MIDI_FREQ[midi_note]
     
     def setup_terminal_input(self):
         """Setup terminal input handling"""
@@ -436,80 +553,73 @@ class ArduinoSynthTUI:
         self.old_terminal_settings = termios.tcgetattr(sys.stdin)
         # New terminal setting unbuffered
         tty.setcbreak(sys.stdin.fileno())
+        # Wake the main loop as soon as a key arrives; os.read then returns
+        # everything pending, so a whole escape sequence comes in one read
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(sys.stdin, selectors.EVENT_READ)
 
     def restore_terminal_input(self):
         """Restore terminal input handling"""
+        self._selector.close()
         termios.tcsetattr(sys.stdin, termios.TCSADRAIN, self.old_terminal_settings)
 
     def handle_input(self):
-        """Handle input from the terminal"""
-        if select.select([sys.stdin], [], [], 0) == ([sys.stdin], [], []):
-            key = sys.stdin.read(1)
-            
-            # Handle escape sequences (arrow keys)
+        """Handle all pending input from the terminal"""
+        data = os.read(sys.stdin.fileno(), 32).decode(errors='ignore')
+        
+        i = 0
+        while i < len(data):
+            key = data[i]
             if key == '\x1b':  # ESC sequence start
-                if self.browsing_files:
-                    self.browsing_files = False  # ESC to exit browser
-                    return
-                # Check if there's more input (arrow keys)
-                if select.select([sys.stdin], [], [], 0.1) == ([sys.stdin], [], []):
-                    key2 = sys.stdin.read(1)
-                    if key2 == '[':
-                        if select.select([sys.stdin], [], [], 0.1) == ([sys.stdin], [], []):
-                            key3 = sys.stdin.read(1)
-                            if self.browsing_files:
-                                self.handle_arrow_key(key3)
-                            return
-                return
+                if data[i + 1:i + 2] == '[' and i + 2 < len(data):
+                    # Arrow keys: ESC [ A/B/C/D
+                    if self.browsing_files:
+                        self.handle_arrow_key(data[i + 2])
+                    i += 3
+                else:
+                    self.close_midi_browser()  # Lone ESC exits the browser
+                    i += 1
+                continue
             
-            if key == 'q':
-                self.quit_app()
-            elif key == ' ':  # Space
-                self.play_demo_note()
-            elif key == '1':
-                self.play_mono_note(60, 400)
-            elif key == '2':
-                self.play_mono_note(62, 400)
-            elif key == '3':
-                self.play_mono_note(64, 400)
-            elif key == '4':
-                self.play_mono_note(65, 400)
-            elif key == '5':
-                self.play_mono_note(67, 400)
-            elif key == 'c':
-                self.play_chord()
-            elif key == 'r':
-                self.reset_stats()
-            elif key == 'm':  # New key for MIDI file browser
-                self.show_midi_browser()
-            elif key == 's':  # Stop playback
-                self.stop_playback()
-            elif self.browsing_files:
-                self.handle_browser_input(key)
+            self.handle_key(key)
+            i += 1
+    
+    def handle_key(self, key):
+        """Handle a single key press"""
+        if key in self._scale_keys:
+            self.play_mono_note(self._scale_keys[key], 400)
+        elif key in self._key_actions:
+            self._key_actions[key]()
+        elif self.browsing_files:
+            self.handle_browser_input(key)
     
     def show_midi_browser(self):
         """Show MIDI file browser"""
-        midi_files = self.find_midi_files()
-        if not midi_files:
+        self._browser_files = self.find_midi_files()
+        if not self._browser_files:
             return
         
         # Set a flag to indicate we're browsing
         self.browsing_files = True
     
+    def close_midi_browser(self):
+        """Leave the MIDI file browser"""
+        self.browsing_files = False
+        self._browser_files = []
+    
     def find_midi_files(self, directory="."):
         """Find MIDI files in directory"""
-        midi_extensions = ['.mid', '.midi', '.MID', '.MIDI']
-        midi_files = []
-        
-        path = Path(directory)
-        for ext in midi_extensions:
-            midi_files.extend(path.glob(f"*{ext}"))
-        
-        return sorted(midi_files)
+        with os.scandir(directory) as entries:
+            midi_files = [
+                Path(entry.path) for entry in entries
+                if entry.name.lower().endswith(('.mid', '.midi')) and entry.is_file()
+            ]
+        midi_files.sort(key=operator.attrgetter('name'))
+        return midi_files
     
     def create_midi_browser_panel(self):
         """Create MIDI file browser panel"""
-        midi_files = self.find_midi_files()
+        midi_files = self._browser_files
         if not midi_files:
             return Panel(
                 Text("No MIDI files found", style="yellow"),
@@ -542,7 +652,7 @@ class ArduinoSynthTUI:
     
     def handle_arrow_key(self, key):
         """Handle arrow key input"""
-        midi_files = self.find_midi_files()
+        midi_files = self._browser_files
         if not midi_files:
             return
             
@@ -553,15 +663,15 @@ class ArduinoSynthTUI:
     
     def handle_browser_input(self, key):
         """Handle input while browsing MIDI files"""
-        midi_files = self.find_midi_files()
+        midi_files = self._browser_files
         if not midi_files:
-            self.browsing_files = False
+            self.close_midi_browser()
             return
         
         if key == '\r' or key == '\n':  # Enter key
             selected_file = midi_files[self.selected_file_index]
             self.current_file = selected_file.name
-            self.browsing_files = False
+            self.close_midi_browser()
             # Start MIDI playback in a separate thread
             threading.Thread(target=self.play_midi_file, args=(str(selected_file),), daemon=True).start()
         elif key.isdigit():
@@ -570,7 +680,7 @@ class ArduinoSynthTUI:
             if 0 <= file_idx < len(midi_files):
                 selected_file = midi_files[file_idx]
                 self.current_file = selected_file.name
-                self.browsing_files = False
+                self.close_midi_browser()
                 threading.Thread(target=self.play_midi_file, args=(str(selected_file),), daemon=True).start()
     
     def quit_app(self):
@@ -586,16 +696,19 @@ class ArduinoSynthTUI:
         """Play a chord"""
         if self.connected:
             self.send_command("CHORD,60,64,800")
-            self.channel_activity["left"] = True
-            self.channel_activity["right"] = True
+            self._set_activity(800)
             self.last_note["left"] = "C4"
             self.last_note["right"] = "E4"
+            self.last_note_midi["left"] = 60
+            self.last_note_midi["right"] = 64
             self.notes_played += 2
-            threading.Timer(0.8, self._reset_activity).start()
+            self.mark_dirty("channels", "stats")
     
     def reset_stats(self):
         """Reset statistics"""
         self.notes_played = 0
+        self.mark_dirty("stats")
+        self.log("Stats reset")
         self._reset_activity()
     
     def stop_playback(self):
@@ -603,12 +716,14 @@ class ArduinoSynthTUI:
         self.playing = False
         if self.connected:
             self.send_command("STOP")
+        self.log("Playback stopped")
         self._reset_activity()
     
     def run(self):
         """Run the TUI"""
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         self.running = True
+        self.log("System ready")
         
         # Try to connect
         self.connect()
@@ -616,17 +731,47 @@ class ArduinoSynthTUI:
         # No need for separate keyboard handlers anymore
         
         try:
-            with Live(self.layout, refresh_per_second=4, screen=True) as live:
+            with Live(self.layout, auto_refresh=False, screen=True) as live:
                 self.setup_terminal_input()
+                self._refresh_error = None
+                refresher = threading.Thread(target=self._refresh_loop, args=(live,), daemon=True)
+                refresher.start()
                 try:
                     while self.running:
-                        self.handle_input()  # Handle terminal input dynamically
-                        self.update_display()
-                        time.sleep(0.1)
+                        # Sleep until a key arrives
+                        if self._selector.select(timeout=self._MAX_FRAME_INTERVAL):
+                            self.handle_input()
+                            self._needs_refresh.set()
                 finally:
+                    self.running = False
+                    self._needs_refresh.set()
+                    refresher.join()
                     self.restore_terminal_input()
+                # Rendering failed on the refresh thread: report it from here
+                if self._refresh_error is not None:
+                    raise self._refresh_error
         except KeyboardInterrupt:
             self.running = False
+    
+    def _refresh_loop(self, live):
+        """Redraw the screen when state changes, rate-limited"""
+        last_frame = 0.0
+        try:
+            while self.running:
+                self._needs_refresh.wait(timeout=self._MAX_FRAME_INTERVAL)
+                self._needs_refresh.clear()
+                
+                delay = self._MIN_FRAME_INTERVAL - (time.monotonic() - last_frame)
+                if delay > 0:
+                    time.sleep(delay)
+                
+                self.update_display()
+                live.refresh()
+                last_frame = time.monotonic()
+        except Exception as e:
+            # Stop the main loop so run() can re-raise this
+            self._refresh_error = e
+            self.running = False
 
 def main():
     """Main function"""
@@ -2,25 +2,157 @@
 """
 Test script for pitch bend and command queue improvements
 Demonstrates guitar-style bends and dense note sequences
+
+Usage: python3 test_bend.py [port] [baud]
+The baud rate must match Serial.begin() in the Arduino sketch (9600 by
+default). Flash the sketch with Serial.begin(115200) and pass 115200 to cut
+the time each command spends on the wire by 12x.
+
+Commands are sent as text lines. This test needs firmware with BEND and a
+command queue; synth/synth.ino has neither, and its binary frames are not
+used here.
 """
 
+import queue
 import serial
+import threading
 import time
 import sys
+import numpy as np
+
+BAUD_RATE = 9600
+
+# Frequency of every MIDI note number, A4 (69) = 440 Hz
+MIDI_FREQ = tuple((440.0 * np.exp2((np.arange(128) - 69) / 12.0)).tolist())
+NOTE_NAMES = ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')
+
+STOP = b"STOP\n"
+
+def freq_command(freq, duration_ms, channel, attack_ms):
+    """Encode a FREQ command line"""
+    return b"FREQ,%.2f,%d,%d,%d\n" % (freq, duration_ms, channel, attack_ms)
+
+class BatchedSerial:
+    """Collects encoded commands and sends them with a single write"""
+    def __init__(self, ser):
+        self.ser = ser
+        self.buffer = bytearray()
+    
+    def send(self, command):
+        self.buffer += command
+    
+    def flush(self):
+        if self.buffer:
+            self.ser.write(bytes(self.buffer))
+            self.buffer.clear()
+
+class DeferredSerial:
+    """Serial port wrapper whose writes are sent in order by a background thread"""
+    def __init__(self, ser):
+        self.ser = ser
+        self.batch = BatchedSerial(ser)
+        # Single producer (the tests) and single consumer (the writer thread)
+        self.queue = queue.Queue()
+        self.error = None  # Write failure from the writer thread, raised on the next call
+        threading.Thread(target=self._writer, daemon=True).start()
+    
+    def __getattr__(self, name):
+        # Reads and everything else go straight to the port
+        return getattr(self.ser, name)
+    
+    def write(self, command, at=None):
+        """Queue a command, optionally held back until monotonic time `at`"""
+        self._raise_error()
+        self.queue.put((command, at))
+    
+    def close(self):
+        self.queue.join()
+        self.ser.close()
+        self._raise_error()
+    
+    def _raise_error(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+    
+    def _writer(self):
+        pending = None
+        while True:
+            command, at = pending if pending else self.queue.get()
+            pending = None
+            if at is not None:
+                time.sleep(max(0.0, at - time.monotonic()))
+            self.batch.send(command)
+            written = 1
+            
+            # Fold anything else that is already due into the same write
+            while True:
+                try:
+                    pending = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if pending[1] is not None and pending[1] > time.monotonic():
+                    break
+                self.batch.send(pending[0])
+                pending = None
+                written += 1
+            
+            try:
+                self.batch.flush()
+            except Exception as e:
+                self.error = e
+                self.batch.buffer.clear()
+            finally:
+                # Always account for the commands so close() can't block forever
+                for _ in range(written):
+                    self.queue.task_done()
+
+def drain(ser):
+    """Read everything the Arduino has sent so far and split it into lines"""
+    buffer = ser.read(ser.in_waiting)
+    return buffer.splitlines() if buffer else []
+
+def play_and_bend(ser, base_midi, target_midi, ch, dur_ms, bend_ms, attack=200):
+    """Play a note, bend it to another note and echo the Arduino's replies"""
+    base_freq = MIDI_FREQ[base_midi]
+    target_freq = MIDI_FREQ[target_midi]
+    
+    print(f"   Sending: FREQ,{base_freq:.2f},{dur_ms},{ch},{attack}")
+    ser.write(freq_command(base_freq, dur_ms, ch, attack))
+    time.sleep(0.5)  # Give note time to start
+    
+    for line in drain(ser):
+        print(f"   Arduino: {line.decode().strip()}")
+    
+    print(f"   Sending: BEND,{ch},{target_freq:.2f},{bend_ms}")
+    ser.write(b"BEND,%d,%.2f,%d\n" % (ch, target_freq, bend_ms))
+    time.sleep(bend_ms / 1000.0 + 0.1)
+    
+    for line in drain(ser):
+        print(f"   Arduino: {line.decode().strip()}")
+    
+    time.sleep(0.5)
 
 def test_command_queue(arduino):
     """Test command queue by sending rapid fire commands"""
     print("\n=== Testing Command Queue (Rapid Notes) ===")
     print("Sending 20 rapid notes to test queue buffering...")
     
-    # Send rapid sequence of notes
-    notes = [60, 62, 64, 65, 67, 69, 71, 72, 71, 69, 67, 65, 64, 62, 60, 58, 56, 55, 53, 51]
-    for i, note in enumerate(notes):
-        freq = 440.0 * (2.0 ** ((note - 69) / 12.0))
-        # Very short duration to stress test the queue
-        arduino.write(f"FREQ,{freq:.2f},100,{i % 2},200\n".encode())
-        time.sleep(0.05)  # 50ms between commands (faster than note duration)
-        print(f"  Sent note {i+1}/20: MIDI {note} ({freq:.1f}Hz)")
+    # Rapid sequence of notes, alternating left/right channels
+    notes = np.array([60, 62, 64, 65, 67, 69, 71, 72, 71, 69, 67, 65, 64, 62, 60, 58, 56, 55, 53, 51])
+    freqs = 440.0 * np.exp2((notes - 69) / 12.0)
+    channels = np.arange(len(notes)) % 2
+    
+    # Very short duration to stress test the queue, paced on a fixed grid by
+    # the writer thread: 50ms between commands (faster than note duration)
+    start = time.monotonic()
+    for i, (freq, channel) in enumerate(zip(freqs, channels)):
+        arduino.write(freq_command(freq, 100, channel, 200), at=start + i * 0.05)
+    time.sleep(max(0.0, start + len(notes) * 0.05 - time.monotonic()))
+    
+    # Report once the sequence is out so terminal output stays off the send path
+    log = [f"  Sent note {i+1}/20: MIDI {note} ({freq:.1f}Hz)" for i, (note, freq) in enumerate(zip(notes, freqs))]
+    sys.stdout.write("\n".join(log) + "\n")
     
     print("✓ Command queue test complete (check if all notes played without drops)")
 
@@ -30,94 +162,47 @@ def test_pitch_bend(arduino):
     
     # Test 1: Simple whole-step bend up
     print("\n1. Whole-step bend up (E4 -> F#4):")
-    base_note = 64  # E4
-    target_note = 66  # F#4
-    base_freq = 440.0 * (2.0 ** ((base_note - 69) / 12.0))
-    target_freq = 440.0 * (2.0 ** ((target_note - 69) / 12.0))
-    
-    # Play base note
-    cmd = f"FREQ,{base_freq:.2f},1500,0,200\n"
-    print(f"   Sending: {cmd.strip()}")
-    arduino.write(cmd.encode())
-    time.sleep(0.5)  # Give note time to start
-    
-    # Check Arduino response
-    while arduino.in_waiting > 0:
-        print(f"   Arduino: {arduino.readline().decode().strip()}")
-    
-    # Bend up over 500ms
-    cmd = f"BEND,0,{target_freq:.2f},500\n"
-    print(f"   Sending: {cmd.strip()}")
-    arduino.write(cmd.encode())
-    time.sleep(0.6)
-    
-    # Check Arduino response
-    while arduino.in_waiting > 0:
-        print(f"   Arduino: {arduino.readline().decode().strip()}")
+    play_and_bend(arduino, 64, 66, 0, 1500, 500)
     
-    time.sleep(0.5)
-    
-    # Stop all channels before test 2
+    # Stop all channels before test 2; queued ahead of test 2's first note
     print("\n   Stopping all channels...")
-    arduino.write(b"STOP\n")
-    time.sleep(0.3)
+    arduino.write(STOP)
     
     # Test 2: Bend down
     print("\n2. Whole-step bend down (G4 -> F4):")
-    base_note = 67  # G4
-    target_note = 65  # F4
-    base_freq = 440.0 * (2.0 ** ((base_note - 69) / 12.0))
-    target_freq = 440.0 * (2.0 ** ((target_note - 69) / 12.0))
-    
-    cmd = f"FREQ,{base_freq:.2f},2000,1,200\n"
-    print(f"   Sending: {cmd.strip()}")
-    arduino.write(cmd.encode())
-    time.sleep(0.5)  # Give note time to start
-    
-    # Check Arduino response
-    while arduino.in_waiting > 0:
-        print(f"   Arduino: {arduino.readline().decode().strip()}")
-    
-    cmd = f"BEND,1,{target_freq:.2f},500\n"
-    print(f"   Sending: {cmd.strip()}")
-    arduino.write(cmd.encode())
-    time.sleep(0.6)
-    
-    # Check Arduino response
-    while arduino.in_waiting > 0:
-        print(f"   Arduino: {arduino.readline().decode().strip()}")
-    
-    time.sleep(0.5)
+    play_and_bend(arduino, 67, 65, 1, 2000, 500)
     
     # Stop all channels before test 3
     print("\n   Stopping all channels...")
-    arduino.write(b"STOP\n")
-    time.sleep(0.3)
+    arduino.write(STOP)
     
     # Test 3: Vibrato (rapid small bends)
     print("\n3. Vibrato effect (A4 with ±0.5 semitone oscillation):")
     base_note = 69  # A4
     base_freq = 440.0
     
-    arduino.write(f"FREQ,{base_freq:.2f},5000,0,200\n".encode())
+    arduino.write(freq_command(base_freq, 5000, 0, 200))
     print(f"   Playing A4 ({base_freq:.1f}Hz) with vibrato")
     time.sleep(0.5)
     
     # Create vibrato by oscillating pitch
     # Slower vibrato with longer bend times
+    # The two bend targets never change, so encode them once: up 0.5 semitones,
+    # then 250ms later back down through center to -0.5
+    bend_up = b"BEND,0,%.2f,200\n" % (440.0 * np.exp2(0.5 / 12.0))
+    bend_down = b"BEND,0,%.2f,200\n" % (440.0 * np.exp2(-0.5 / 12.0))
+    
+    next_cycle = time.monotonic()
     for i in range(6):
-        # Bend up 0.5 semitones
-        bent_freq = 440.0 * (2.0 ** (0.5 / 12.0))
-        arduino.write(f"BEND,0,{bent_freq:.2f},200\n".encode())
-        time.sleep(0.25)  # Wait for bend to mostly complete
+        arduino.write(bend_up, at=next_cycle)
+        arduino.write(bend_down, at=next_cycle + 0.25)
         
-        # Bend down 0.5 semitones (back through center)
-        bent_freq = 440.0 * (2.0 ** (-0.5 / 12.0))
-        arduino.write(f"BEND,0,{bent_freq:.2f},200\n".encode())
-        time.sleep(0.25)
+        # One up/down cycle per 500ms grid slot
+        next_cycle += 0.5
+        time.sleep(max(0.0, next_cycle - time.monotonic()))
     
     # Return to center
-    arduino.write(f"BEND,0,{base_freq:.2f},150\n".encode())
+    arduino.write(b"BEND,0,%.2f,150\n" % base_freq)
     time.sleep(1.0)
     
     print("✓ Pitch bend test complete")
@@ -138,23 +223,25 @@ def test_blues_lick(arduino):
     ]
     
     print("Playing blues lick on left channel...")
+    note_start = time.monotonic()
     for note, duration, bend_to in lick:
-        freq = 440.0 * (2.0 ** ((note - 69) / 12.0))
-        arduino.write(f"FREQ,{freq:.2f},{duration},0,200\n".encode())
-        note_name = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B'][note % 12]
+        freq = MIDI_FREQ[note]
+        arduino.write(freq_command(freq, duration, 0, 200))
+        note_name = NOTE_NAMES[note % 12]
         octave = (note // 12) - 1
         
         if bend_to:
-            time.sleep(0.1)  # Let note start
-            bend_freq = 440.0 * (2.0 ** ((bend_to - 69) / 12.0))
-            arduino.write(f"BEND,0,{bend_freq:.2f},300\n".encode())
-            bend_note_name = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B'][bend_to % 12]
+            bend_freq = MIDI_FREQ[bend_to]
+            arduino.write(b"BEND,0,%.2f,300\n" % bend_freq, at=note_start + 0.1)  # Let note start
+            bend_note_name = NOTE_NAMES[bend_to % 12]
             bend_octave = (bend_to // 12) - 1
             print(f"   {note_name}{octave} -> BEND -> {bend_note_name}{bend_octave}")
         else:
             print(f"   {note_name}{octave}")
         
-        time.sleep(duration / 1000.0)
+        # Schedule against note start times so printing and writing don't add drift
+        note_start += duration / 1000.0
+        time.sleep(max(0.0, note_start - time.monotonic()))
     
     print("✓ Blues lick test complete")
 
@@ -162,22 +249,32 @@ def main():
     # Default port for Linux/Debian
     port = '/dev/ttyUSB0'
     
-    # Check command line argument for custom port
+    baud_rate = BAUD_RATE
+    
+    # Check command line arguments for custom port and baud rate
     if len(sys.argv) > 1:
         port = sys.argv[1]
+    if len(sys.argv) > 2:
+        baud_rate = int(sys.argv[2])
     
-    print(f"Connecting to Arduino on {port}...")
+    print(f"Connecting to Arduino on {port} at {baud_rate} baud...")
     
     try:
-        arduino = serial.Serial(port, 9600, timeout=1)
+        port_handle = serial.Serial(port, baud_rate, timeout=0.1, xonxoff=False, rtscts=False)
+        try:
+            # Keeps the Arduino's replies to FREQ/BEND from sitting in the USB adapter
+            port_handle.set_low_latency_mode(True)
+        except (AttributeError, NotImplementedError, ValueError):
+            pass
+        arduino = DeferredSerial(port_handle)
         time.sleep(2)  # Wait for Arduino to initialize
         print("✓ Connected!")
         
         # Read any startup messages
         print("\n--- Arduino Startup Messages ---")
         time.sleep(0.5)
-        while arduino.in_waiting > 0:
-            print(arduino.readline().decode().strip())
+        for line in drain(arduino):
+            print(line.decode().strip())
         print("--- End Startup Messages ---")
         
         # Run tests
@@ -191,7 +288,7 @@ def main():
         
         # Stop all
         print("\n=== Stopping all channels ===")
-        arduino.write(b"STOP\n")
+        arduino.write(STOP)
         
         arduino.close()
         print("\n✓ All tests complete!")
@@ -199,7 +296,7 @@ def main():
     except serial.SerialException as e:
         print(f"Error: Could not connect to Arduino on {port}")
         print(f"Details: {e}")
-        print(f"\nUsage: python3 test_bend.py [port]")
+        print(f"\nUsage: python3 test_bend.py [port] [baud]")
         print(f"Example: python3 test_bend.py /dev/ttyACM0")
         sys.exit(1)
 
@@ -9,12 +9,17 @@ import sys
 
 # Arduino connection
 ARDUINO_PORT = '/dev/cu.usbmodem1101'  # Change this to your port
-BAUD_RATE = 9600
+BAUD_RATE = 9600  # Must match Serial.begin() in the sketch
 
 def test_mono():
     try:
         print(f"Connecting to Arduino on {ARDUINO_PORT}...")
-        arduino = serial.Serial(ARDUINO_PORT, BAUD_RATE, timeout=2)
+        arduino = serial.Serial(ARDUINO_PORT, BAUD_RATE, timeout=0.1, xonxoff=False, rtscts=False)
+        try:
+            # Best effort: only Linux serial drivers support low-latency mode
+            arduino.set_low_latency_mode(True)
+        except (AttributeError, NotImplementedError, ValueError):
+            pass
         time.sleep(2)
         print("Connected!")
         
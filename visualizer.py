@@ -1,10 +1,23 @@
 import sys
+import time
 from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget, QPushButton, QLabel
-from PyQt5.QtCore import QTimer
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
 from PyQt5.QtMultimedia import QAudioDeviceInfo, QAudioFormat, QAudioInput
 import numpy as np
 import pyqtgraph as pg
 
+# GPU line rendering; antialiasing is not worth its cost on a waveform
+pg.setConfigOptions(useOpenGL=True, antialias=False)
+
+# The plot is only ~800px wide, so more points than this just overdraw
+MAX_PLOT_POINTS = 1024
+
+# Redraw at most 20 times a second, however often the device delivers data
+PLOT_INTERVAL = 0.05
+
+# Capture buffer: 2048 bytes = 1024 mono int16 samples, ~23ms at 44.1kHz
+AUDIO_BUFFER_BYTES = 2048
+
 class AudioVisualizer(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -23,6 +36,10 @@ class AudioVisualizer(QMainWindow):
 
         # Visualization
         self.plotWidget = pg.PlotWidget(self)
+        self.plotWidget.setXRange(0, MAX_PLOT_POINTS)
+        self.plotWidget.setYRange(-32768, 32767)
+        self.plotWidget.disableAutoRange()
+        self.curve = self.plotWidget.plot(pen='y')  # Updated in place with setData
         layout.addWidget(self.plotWidget)
 
         # Control buttons
@@ -37,13 +54,10 @@ class AudioVisualizer(QMainWindow):
         layout.addWidget(self.statusLabel)
 
     def initAudio(self):
-        self.audioInput = None
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.updatePlot)
-
-        self.audioStream = None
+        self.audioThread = None
+        self.audioWorker = None
 
-    def startAudio(self):
+        # Negotiate the capture format once rather than on every start
         format = QAudioFormat()
         format.setChannelCount(1)
         format.setSampleRate(44100)
@@ -54,21 +68,96 @@ class AudioVisualizer(QMainWindow):
 
         info = QAudioDeviceInfo(QAudioDeviceInfo.defaultInputDevice())
         if not info.isFormatSupported(format):
-            print("Default format not supported, trying to use the nearest")
             format = info.nearestFormat(format)
+        self.audioFormat = format
+
+    def startAudio(self):
+        self.stopAudio()
+
+        # Capture runs on its own thread so a busy GUI can't stall the audio input
+        self.audioThread = QThread(self)
+        self.audioWorker = AudioWorker(self.audioFormat)
+        self.audioWorker.moveToThread(self.audioThread)
+        self.audioThread.started.connect(self.audioWorker.start)
+        # finished is emitted on the worker thread, so the input is stopped and
+        # the worker deleted on the thread that owns them
+        self.audioThread.finished.connect(self.audioWorker.stop)
+        self.audioThread.finished.connect(self.audioWorker.deleteLater)
+        self.audioThread.finished.connect(self.audioThread.deleteLater)
+        self.audioWorker.samplesReady.connect(self.onSamples)
+        self.audioWorker.statusChanged.connect(self.statusLabel.setText)
+        self.audioThread.start()
+
+    def onSamples(self, samples):
+        self.curve.setData(samples)
+
+    def stopAudio(self):
+        if self.audioThread is None:
+            return
+        self.audioThread.quit()
+        self.audioThread.wait()
+        self.audioThread = None
+        self.audioWorker = None
 
-        self.audioInput = QAudioInput(format, self)
+    def closeEvent(self, event):
+        self.stopAudio()
+        super().closeEvent(event)
+
+class AudioWorker(QObject):
+    """Reads the audio input on a worker thread and emits the latest samples"""
+    samplesReady = pyqtSignal(object)
+    statusChanged = pyqtSignal(str)
+
+    def __init__(self, format):
+        super().__init__()
+        self.format = format
+        self.audioInput = None
+        self.audioStream = None
+        # Rolling window of the newest samples, always MAX_PLOT_POINTS wide
+        self.samples = np.zeros(MAX_PLOT_POINTS, dtype=np.int16)
+        self.lastEmit = 0.0
+
+    def start(self):
+        # Created here so the device lives on the worker thread
+        self.audioInput = QAudioInput(self.format, self)
+        # A small buffer keeps the plot close to live; the OS default can hold 100ms+
+        self.audioInput.setBufferSize(AUDIO_BUFFER_BYTES)
         self.audioStream = self.audioInput.start()
-        self.timer.start(50)
-
-    def updatePlot(self):
-        if self.audioStream is not None:
-            data = self.audioStream.readAll()
-            if data:
-                samples = np.frombuffer(data, dtype=np.int16)
-                self.plotWidget.plot(samples, clear=True)
-
-app = QApplication(sys.argv)
-visualizer = AudioVisualizer()
-visualizer.show()
-sys.exit(app.exec_())
+        # The backend may round the request up, so report what we actually got
+        buffer_size = self.audioInput.bufferSize()
+        latency_ms = self.format.durationForBytes(buffer_size) / 1000  # durationForBytes is in µs
+        self.statusChanged.emit(f"Status: Capturing ({buffer_size} byte buffer, {latency_ms:.0f}ms)")
+        # Read whenever the device delivers data instead of polling on a timer
+        self.audioStream.readyRead.connect(self.readSamples)
+
+    def stop(self):
+        if self.audioInput is not None:
+            self.audioInput.stop()
+
+    def readSamples(self):
+        # Whole int16 samples only; read() hands back plain bytes that
+        # numpy can wrap without another copy
+        available = self.audioInput.bytesReady() & ~1
+        data = self.audioStream.read(available) if available else None
+        if not data:
+            return
+
+        chunk = np.frombuffer(data, dtype=np.int16)[-MAX_PLOT_POINTS:]
+        count = len(chunk)
+        self.samples[:-count] = self.samples[count:]
+        self.samples[-count:] = chunk
+
+        now = time.monotonic()
+        if now - self.lastEmit >= PLOT_INTERVAL:
+            self.lastEmit = now
+            # Copy, since the buffer keeps changing on this thread
+            self.samplesReady.emit(self.samples.copy())
+
+def main():
+    app = QApplication(sys.argv)
+    visualizer = AudioVisualizer()
+    visualizer.show()
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    main()